@@ -1,10 +1,14 @@
 import pandas as pd
+import matplotlib
+# Non-interactive backend, figures are only written to the figures folder
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 import yaml
+import os
 
-def cleaning_productivity_data(df):
+def cleaning_productivity_data(df, verbose=False):
     """
     Cleans the Extended_Employee_Performance_and_Productivity_Data.csv DataFrame by 
     performing multiple data preparation steps, including
@@ -15,11 +19,12 @@ def cleaning_productivity_data(df):
     df (pandas.DataFrame): The input dataset to clean. Expected to contain columns such as 
     'Employee_ID', 'Hire_Date', 'Team_Size', 'Department', 'Remote_Work_Frequency', 
     'Promotions', 'Training_Hours', 'Employee_Satisfaction_Score', and 'Performance_Score'.
+    verbose (bool): If True, prints the first rows of the cleaned dataset. Default is False.
 
     Returns:
     pandas.DataFrame(df_cleaned): The cleaned dataset with the following transformations:
         - Columns 'Employee_ID', 'Hire_Date', and 'Team_Size' are dropped.
-        - Rows are filtered to include only 'IT' department and exclude certain 'Remote_Work_Frequency' values (75 and 25).
+        - Rows are filtered to include only 'IT' department and the 'Remote_Work_Frequency' values 100, 50 and 0 (excluding 75 and 25).
         - 'Remote_Work_Frequency' values are replaced with labels ('Remote', 'Hybrid', 'Onsite') and renamed to 'work_type'.
         - 'Promotions' and 'Training_Hours' columns are normalized to a 1-5 scale, and a 'Motivation_Score' is calculated as the average of four factors.
         - Column names are standardized to lowercase, and work types are set as an ordered categorical variable.
@@ -39,7 +44,7 @@ def cleaning_productivity_data(df):
     >>> print(df_cleaned.head())
 
     Notes:
-    - The function filters only for rows in the 'IT' department and excludes 'Remote_Work_Frequency' values of 25 and 75.
+    - The function filters only for rows in the 'IT' department and keeps 'Remote_Work_Frequency' values of 0, 50 and 100, excluding 25 and 75.
     - Converts 'Remote_Work_Frequency' values into readable labels ('Remote', 'Hybrid', 'Onsite') and renames the column to 'work_type'.
     - Adds a 'Motivation_Score' column as the average of normalized 'Employee_Satisfaction_Score', 'Performance_Score', 'Promotions', and 'Training_Hours' on a 1-5 scale.
     - Column names are converted to lowercase, and 'work_type' is set as an ordered categorical variable.
@@ -49,63 +54,67 @@ def cleaning_productivity_data(df):
     df_cleaned = df.drop(columns=['Employee_ID', 'Hire_Date', 'Team_Size'], errors='ignore')
 
     # Filter for only IT department and Remote work Frequencies to a more managable, 100, 50, 0
-    df_cleaned = df_cleaned[(df_cleaned['Department'] == 'IT') & 
-                (df_cleaned['Remote_Work_Frequency'] != 75) & 
-                (df_cleaned['Remote_Work_Frequency'] != 25)].copy()
-
-    # Replace Remote_Work_Frequency values with readable labels
-    df_cleaned['Remote_Work_Frequency'] = df_cleaned['Remote_Work_Frequency'].replace({
-        100: 'Remote',
-        50: 'Hybrid',
-        0: 'Onsite'
-    })
-
-    # Normalize 'Promotions' and 'Training Hours' to a 1-5 range to create a Motivations Score
-    df_cleaned['Promotions_Normalized'] = (df_cleaned['Promotions'] / df_cleaned['Promotions'].max()) * 4 + 1
-    df_cleaned['Training_Hours_Normalized'] = (df_cleaned['Training_Hours'] / df_cleaned['Training_Hours'].max()) * 4 + 1
-
-    # Calculate the Motivation Score within a 1-5 range
-    df_cleaned['Motivation_Score'] = (
-    df_cleaned['Employee_Satisfaction_Score'] +
-    df_cleaned['Performance_Score'] +
-    df_cleaned['Promotions_Normalized'] +
-    df_cleaned['Training_Hours_Normalized']
-    ) / 4  # Averaging the four factors
-
-    # Round the Motivation Score to 2 decimal places
-    df_cleaned['Motivation_Score'] = df_cleaned['Motivation_Score'].round(2)
-
-    # Drop the temporary normalization columns
-    df_cleaned = df_cleaned.drop(columns=['Promotions_Normalized', 'Training_Hours_Normalized']).reset_index(drop=True)
+    mask = (df_cleaned['Department'].eq('IT').to_numpy(dtype=bool, na_value=False) & 
+            np.isin(df_cleaned['Remote_Work_Frequency'].to_numpy(), [0, 50, 100]))
+    df_cleaned = df_cleaned.loc[mask].reset_index(drop=True)
+
+    # Calculate the Motivation Score within a 1-5 range in a single pass over the underlying arrays,
+    # normalizing 'Promotions' and 'Training Hours' to a 1-5 range inline instead of in temporary columns
+    promo = df_cleaned['Promotions'].to_numpy(dtype=np.float64, copy=True)
+    train = df_cleaned['Training_Hours'].to_numpy(dtype=np.float64, copy=True)
+    sat = df_cleaned['Employee_Satisfaction_Score'].to_numpy(dtype=np.float64)
+    perf = df_cleaned['Performance_Score'].to_numpy(dtype=np.float64)
+
+    # Compute each maximum once, as a plain Python float, NaN when the filter keeps no rows
+    pmax = float(promo.max()) if promo.size else np.nan
+    tmax = float(train.max()) if train.size else np.nan
+
+    # Normalize in place on the copied arrays
+    promo *= 4.0 / pmax
+    promo += 1.0
+    train *= 4.0 / tmax
+    train += 1.0
+
+    # Averaging the four factors and rounding to 2 decimal places, accumulating in one output buffer
+    motivation = sat + perf
+    motivation += promo
+    motivation += train
+    motivation *= 0.25
+    df_cleaned['Motivation_Score'] = np.round(motivation, 2, out=motivation)
 
     # Change column names to lowercase
     df_cleaned.columns = df_cleaned.columns.str.lower()
 
-    # Rename 'remote_work_frequency' to 'work_type'
-    df_cleaned = df_cleaned.rename(columns={'remote_work_frequency': 'work_type'})
-
-    # Set the order of work_type categories
-    df_cleaned['work_type'] = pd.Categorical(
-    df_cleaned['work_type'],
+    # Replace 'remote_work_frequency' (100, 50, 0) in place by 'work_type', mapping the values
+    # straight to the int8 codes of the ordered work_type categories
+    work_type_position = df_cleaned.columns.get_loc('remote_work_frequency')
+    df_cleaned.insert(work_type_position, 'work_type', pd.Categorical.from_codes(
+    (2 - df_cleaned.pop('remote_work_frequency').to_numpy() // 50).astype(np.int8),
     categories=['Remote', 'Hybrid', 'Onsite'],
     ordered=True
-    )
-    #display all columns
-    pd.set_option('display.max_columns', None)
-    print(df_cleaned.head())
+    ))
+
+    # Downcast the 1-5 score columns to narrow dtypes to halve the bytes touched by later groupbys,
+    # pd.to_numeric only picks a dtype that holds every value so out-of-range scores are never wrapped
+    df_cleaned['performance_score'] = pd.to_numeric(df_cleaned['performance_score'], downcast='integer')
+    df_cleaned['employee_satisfaction_score'] = pd.to_numeric(df_cleaned['employee_satisfaction_score'], downcast='float')
+
+    if verbose:
+        print(df_cleaned.head())
 
     return df_cleaned
 
-def describe_work_type_stats(df_cleaned, column_name='work_type', work_types=['Remote', 'Hybrid', 'Onsite']):   
+def describe_work_type_stats(df_cleaned, column_name='work_type', work_types=['Remote', 'Hybrid', 'Onsite'], verbose=False):   
     """
     Filters the DataFrame for specified work type values, groups by the work type column, 
-    and calculates descriptive statistics for each group. The function displays all columns 
-    in the output for easier analysis.
+    and calculates descriptive statistics for each group. With `verbose=True` the statistics 
+    are printed as well.
 
     Parameters:
     df (pandas.DataFrame): The DataFrame containing the data to analyze.
     column_name (str): The name of the column to filter and group by. Default is 'work_type'.
     work_types (list): A list of work type values to filter for (e.g., ['Remote', 'Hybrid', 'Onsite']).
+    verbose (bool): If True, prints the descriptive statistics. Default is False.
 
     Returns:
     pandas.DataFrame: A DataFrame with descriptive statistics for each specified work type.
@@ -116,10 +125,12 @@ def describe_work_type_stats(df_cleaned, column_name='work_type', work_types=['R
     ValueError: If `work_types` is not a list.
 
     Notes:
-    - The function uses `pd.set_option('display.max_columns', None)` to display all columns 
-      in the output, making it easier to view all descriptive statistics.
+    - Set `pd.set_option('display.max_columns', None)` once in the calling script to display all columns 
+      in the printed output, making it easier to view all descriptive statistics.
     - The `observed=True` parameter in `groupby` limits grouping to observed categories only,
       which improves performance and aligns with future behavior in pandas.
+    - Only the numeric columns are aggregated, with the same statistics and labels as `describe()`
+      (count, mean, std, min, 25%, 50%, 75% and max) per work type.
 
     Examples:
     >>> import pandas as pd
@@ -128,15 +139,22 @@ def describe_work_type_stats(df_cleaned, column_name='work_type', work_types=['R
     >>> print(describe_stats)
     """
     
-    # Filter data for specified work types
-    filtered_df = df_cleaned[df_cleaned[column_name].isin(work_types)]
+    # Filter data for specified work types, keeping only the work type and numeric columns
+    numeric_cols = df_cleaned.select_dtypes(include='number').columns
+    filtered_df = df_cleaned.loc[df_cleaned[column_name].isin(work_types), [column_name, *numeric_cols]]
+
+    # Group by work type and calculate the descriptive statistics with cythonized aggregations
+    grouped = filtered_df.groupby(column_name, observed=True)
+    stats = grouped.agg(['count', 'mean', 'std', 'min', 'median', 'max']).rename(columns={'median': '50%'}, level=1)
+    quartiles = grouped.quantile([0.25, 0.75]).unstack().rename(columns={0.25: '25%', 0.75: '75%'}, level=1)
 
-    # Group by work type and calculate descriptive statistics
-    describe_stats = filtered_df.groupby(column_name, observed=True).describe()
+    # Combine into the column order of describe()
+    describe_order = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+    describe_stats = pd.concat([stats, quartiles], axis=1).reindex(
+        columns=pd.MultiIndex.from_product([numeric_cols, describe_order]))
 
-    # Set display option to show all columns
-    pd.set_option('display.max_columns', None)
-    print(describe_stats)
+    if verbose:
+        print(describe_stats)
 
     return describe_stats
 
@@ -163,99 +181,96 @@ def plot_work_type_distribution(df_cleaned, work_type):
     value_counts = df_cleaned['work_type'].value_counts()
 
     # Plot a donut chart
-    plt.figure(figsize=(6, 6))
-    plt.pie(value_counts, labels=value_counts.index, autopct='%1.1f%%', startangle=140, wedgeprops={'width': 0.3})
-    plt.title(f"Distribution of {'Work Type'.capitalize()}")
+    fig, ax = plt.subplots(figsize=(6, 6))
+    ax.pie(value_counts, labels=value_counts.index, autopct='%1.1f%%', startangle=140, wedgeprops={'width': 0.3})
+    ax.set_title(f"Distribution of {'Work Type'.capitalize()}")
 
     #saves figure
-    plt.savefig("../figures/distribution_of_work_type.jpeg", format="jpeg", dpi=300)
+    fig.savefig("../figures/distribution_of_work_type.jpeg", format="jpeg", dpi=100)
 
-    #displays figure
-    plt.show()
+    #closes figure
+    plt.close(fig)
     
     # Return the counts
     return value_counts
 
-def plot_stacked_work_and_overtime_hours(df_cleaned):
+def plot_stacked_work_and_overtime_hours(mean_hours):
     """
     Plots the average work hours and overtime hours by work type as a stacked bar chart.
 
-    The function calculates the average 'work_hours_per_week' and 'overtime_hours' 
-    grouped by 'work_type' and plots these values in a stacked bar chart.
+    The function takes the average 'work_hours_per_week' and 'overtime_hours' 
+    already grouped by 'work_type' and plots these values in a stacked bar chart.
 
     Parameters:
-    - df_cleaned(pandas.DataFrame): The input DataFrame expected to contain 'work_type', 'work_hours_per_week', and 'overtime_hours' columns.
+    - mean_hours(pandas.DataFrame): The mean 'work_hours_per_week' and 'overtime_hours' columns, indexed by 'work_type'.
 
     Returns:
-    - None: The function displays the plot in the Jupyter notebook output and 
-            saves the figure as a JPEG file
+    - pandas.DataFrame: The plotted mean_hours. The function saves the figure as a JPEG file
 
     Example Usage:
-    # Assume df_cleaned is a DataFrame with the necessary columns.
-    plot_stacked_work_and_overtime_hours(df_cleaned)
+    # Assume work_type_groups = df_cleaned.groupby('work_type', observed=True)
+    mean_hours = work_type_groups[['work_hours_per_week', 'overtime_hours']].mean()
+    plot_stacked_work_and_overtime_hours(mean_hours)
     
     Notes:
     - The stacked chart shows total hours per work type with sections representing 
       regular work hours and overtime hours.
     """
-    
-    # Calculate the mean work hours and overtime hours by work type
-    mean_hours = df_cleaned.groupby('work_type', observed=True)[['work_hours_per_week', 'overtime_hours']].mean()
 
     # Plot a stacked bar chart
-    plt.figure(figsize=(10, 6))
+    fig, ax = plt.subplots(figsize=(10, 6))
     work_types = mean_hours.index
     work_hours = mean_hours['work_hours_per_week']
     overtime_hours = mean_hours['overtime_hours']
     
     # Create stacked bars
-    plt.bar(work_types, work_hours, label='Work Hours', color='skyblue')
-    plt.bar(work_types, overtime_hours, bottom=work_hours, label='Overtime Hours', color='salmon')
+    ax.bar(work_types, work_hours, label='Work Hours', color='skyblue')
+    ax.bar(work_types, overtime_hours, bottom=work_hours, label='Overtime Hours', color='salmon')
     
     # Add labels and title
-    plt.title("Average Work and Overtime Hours by Work Type")
-    plt.ylabel("Average Hours")
-    plt.xlabel("Work Type")
-    plt.legend()
+    ax.set_title("Average Work and Overtime Hours by Work Type")
+    ax.set_ylabel("Average Hours")
+    ax.set_xlabel("Work Type")
+    ax.legend()
 
     #saves chart as a jpeg
-    plt.savefig("../figures/work_hours.jpeg", format="jpeg", dpi=300)
+    fig.savefig("../figures/work_hours.jpeg", format="jpeg", dpi=100)
 
-    # Show the plot
-    plt.show()
+    # Close the plot
+    plt.close(fig)
 
     return mean_hours
 
-def calculate_avg_median_scores_by_work_type(df_cleaned):
+def calculate_avg_median_scores_by_work_type(work_type_groups):
     """
     Calculates the average (mean) and median scores for Performance, Motivation, 
     and Employee Satisfaction by work type.
 
     Parameters:
-    - df_cleaned(pandas.DataFrame): The input DataFrame, expected to contain 'work_type', 'performance_score', 'motivation_score', and 
-    'employee_satisfaction_score' columns. 
+    - work_type_groups(pandas.core.groupby.DataFrameGroupBy): The cleaned DataFrame grouped by 'work_type', expected to contain 
+    'performance_score', 'motivation_score', and 'employee_satisfaction_score' columns. 
     
     Returns:
     - pandas.DataFrame: A pivot table showing the mean and median of each score type 
                         (Performance, Motivation, Satisfaction) by work type.
 
     Example Usage:
-    >>> # Assume df_cleaned is a DataFrame with the necessary columns.
-    >>> pivot_avg_scores = calculate_avg_median_scores_by_work_type(df_cleaned)
+    >>> work_type_groups = df_cleaned.groupby('work_type', observed=True)
+    >>> pivot_avg_scores = calculate_avg_median_scores_by_work_type(work_type_groups)
     >>> display(pivot_avg_scores)
 
     Notes:
-    - The function creates a pivot table grouped by 'work_type', calculating both 
+    - The function reuses the existing 'work_type' grouping, calculating both 
       mean and median values for 'performance_score', 'motivation_score', and 
-      'employee_satisfaction_score'.
+      'employee_satisfaction_score' laid out like `pivot_table(aggfunc=['mean', 'median'])`.
     """
     
     # Create the pivot table with mean and median for each score by work type
-    pivot_avg_scores = df_cleaned.pivot_table(
-        values=['performance_score', 'motivation_score', 'employee_satisfaction_score'],
-        index='work_type',
-        aggfunc=['mean', 'median'],
-        observed=True
+    pivot_avg_scores = (
+        work_type_groups[['performance_score', 'motivation_score', 'employee_satisfaction_score']]
+        .agg(['mean', 'median'])
+        .swaplevel(axis=1)
+        .sort_index(axis=1)
     )
 
     # Display the pivot table
@@ -263,44 +278,44 @@ def calculate_avg_median_scores_by_work_type(df_cleaned):
     
     return pivot_avg_scores
 
-def plot_average_scores_by_work_type(df_cleaned, work_type):
+def plot_average_scores_by_work_type(mean_scores):
     """
-    Calculates and plots the average scores for specified metrics by work type.
+    Plots the average scores for specified metrics by work type.
 
-    This function groups the data by work type, calculates the mean scores for the specified columns, 
-    and generates a bar chart to visualize the average scores. The plot can optionally be saved to a specified path.
+    This function takes the mean scores already grouped by work type 
+    and generates a bar chart to visualize the average scores. The plot is saved to the figures folder.
 
     Parameters:
-    df_cleaned(pandas.DataFrame): The DataFrame containing the data.
-    work_type_column (str): The name of the column representing work type (e.g., 'Remote', 'Hybrid', 'Onsite'). Default is 'work_type'.
-    score_columns (list): A list of column names for the metrics to calculate average scores for (e.g., ['performance_score', 'employee_satisfaction_score', 'motivation_score']).
+    mean_scores(pandas.DataFrame): The mean scores indexed by 'work_type' (e.g., 'Remote', 'Hybrid', 'Onsite'), one column per metric 
+    (e.g., ['performance_score', 'employee_satisfaction_score', 'motivation_score']).
 
     Returns:
     mean_score 
-    saves the file as a jpeg
-    Displays a bar chart of average scores by work type.
+    saves the bar chart of average scores by work type as a jpeg
 
     Example Usage:
-    plot_average_scores_by_work_type(df_cleaned, 'work_type')
-    display(mean_scores_melted)
+    mean_scores = work_type_groups[['performance_score', 'employee_satisfaction_score', 'motivation_score']].mean()
+    plot_average_scores_by_work_type(mean_scores)
 
      Notes:
     - This function requires Seaborn for the bar chart and Matplotlib for plotting and saving the image.
     """
-    
-    # Calculate mean scores by work type
-    mean_scores = df_cleaned.groupby('work_type', observed=True)[['performance_score', 'employee_satisfaction_score', 'motivation_score']].mean().reset_index()
 
-    # Melt the DataFrame for easier plotting
-    mean_scores_melted = mean_scores.melt(id_vars='work_type', var_name='Score Type', value_name='Average_Score')
+    # Stack the small aggregated DataFrame into long format for easier plotting
+    mean_scores_melted = (
+        mean_scores.rename_axis(columns='Score Type')
+        .stack(future_stack=True)
+        .rename('Average_Score')
+        .reset_index()
+    )
 
     # Plot a bar chart
-    plt.figure(figsize=(10, 6))
-    sns.barplot(data=mean_scores_melted, x='Score Type', y='Average_Score', hue='work_type')
-    plt.title("Average Scores of Performance, Satisfaction, and Motivation by Work Type")
-    plt.ylabel("Average Score")
-    plt.savefig("../figures/average_scores.jpeg", format="jpeg", dpi=300)
-    plt.show()
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.barplot(data=mean_scores_melted, x='Score Type', y='Average_Score', hue='work_type', ax=ax)
+    ax.set_title("Average Scores of Performance, Satisfaction, and Motivation by Work Type")
+    ax.set_ylabel("Average Score")
+    fig.savefig("../figures/average_scores.jpeg", format="jpeg", dpi=100)
+    plt.close(fig)
 
     #display long format table
     print(mean_scores_melted)
@@ -317,7 +332,7 @@ def plot_scores_by_work_type(df_cleaned):
     and 'performance_score' columns.
                              
     Returns:
-    - None: The function displays the plot in the Jupyter notebook output and saves the figure as a JPEG file.
+    - None: The function saves the figure as a JPEG file.
 
     Example Usage:
     >>> # Assume df_cleaned is a DataFrame with the necessary columns.
@@ -329,31 +344,28 @@ def plot_scores_by_work_type(df_cleaned):
     """
     
     # Set up the figure and individual box plots
-    plt.figure(figsize=(14, 6))
+    fig, axes = plt.subplots(1, 3, figsize=(14, 6))
     
     # Employee Satisfaction Score
-    plt.subplot(1, 3, 1)
-    sns.boxplot(x='work_type', y='employee_satisfaction_score', data=df_cleaned)
-    plt.title('Employee Satisfaction Score by Work Type')
+    sns.boxplot(x='work_type', y='employee_satisfaction_score', data=df_cleaned, ax=axes[0])
+    axes[0].set_title('Employee Satisfaction Score by Work Type')
 
     # Motivation Score
-    plt.subplot(1, 3, 2)
-    sns.boxplot(x='work_type', y='motivation_score', data=df_cleaned)
-    plt.title('Motivation Score by Work Type')
+    sns.boxplot(x='work_type', y='motivation_score', data=df_cleaned, ax=axes[1])
+    axes[1].set_title('Motivation Score by Work Type')
 
     # Performance Score
-    plt.subplot(1, 3, 3)
-    sns.boxplot(x='work_type', y='performance_score', data=df_cleaned)
-    plt.title('Performance Score by Work Type')
+    sns.boxplot(x='work_type', y='performance_score', data=df_cleaned, ax=axes[2])
+    axes[2].set_title('Performance Score by Work Type')
 
     # Adjust layout for spacing
-    plt.tight_layout()
+    fig.tight_layout()
 
     #save the plot
-    plt.savefig("../figures/average_scores.jpeg", format="jpeg", dpi=300)
+    fig.savefig("../figures/average_scores.jpeg", format="jpeg", dpi=100)
     
-    # Show the plot
-    plt.show()
+    # Close the plot
+    plt.close(fig)
 
 def heat_map(df_cleaned):
     """
@@ -375,20 +387,29 @@ def heat_map(df_cleaned):
     """
     numerical_df = df_cleaned.select_dtypes(include='number')
 
-    # Calculate the correlation matrix for numerical columns
-    correlation_matrix = numerical_df.corr()
+    # Calculate the Pearson correlation matrix for numerical columns as a single matrix product
+    # of the standardized values, the cleaned data has no missing values
+    values = numerical_df.to_numpy(dtype=np.float64, copy=True)
+    values -= values.mean(axis=0)
+    values /= values.std(axis=0, ddof=1)
+    correlation_matrix = pd.DataFrame(
+    (values.T @ values) / (values.shape[0] - 1),
+    index=numerical_df.columns,
+    columns=numerical_df.columns
+    )
 
     # Plot the heatmap
-    plt.figure(figsize=(12, 8))  # Adjust the figure size as needed
-    sns.heatmap(correlation_matrix, annot=True, cmap="coolwarm", fmt=".2f", linewidths=0.5)
-    plt.title("Correlation Heatmap of Numerical Values")
+    fig, ax = plt.subplots(figsize=(12, 8))  # Adjust the figure size as needed
+    sns.heatmap(correlation_matrix, annot=True, cmap="coolwarm", fmt=".2f", linewidths=0.5, ax=ax)
+    ax.set_title("Correlation Heatmap of Numerical Values")
 
     #save the plot
-    plt.savefig("../figures/heat_map.jpeg", format="jpeg", dpi=300)
+    fig.savefig("../figures/heat_map.jpeg", format="jpeg", dpi=100)
 
-    #display the plot
-    plt.show()
+    #close the plot
+    plt.close(fig)
 
+    return correlation_matrix
 
 
 def df_mentalhealth_cleaning(df2):
@@ -401,109 +422,97 @@ def df_mentalhealth_cleaning(df2):
     #Rename the columns
 
     df2.columns = df2.columns.str.lower()
-    
-    #Creating columns to reflect categories of rating columns
-    
-    def support_remote_grade(grade):
-        if grade <= 2:
-            return 'Low'
-        if grade == 3:
-            return 'Medium'
-        else:
-            return 'High'
-
-    df2['degree_of_remote_support'] = df2['company_support_for_remote_work'].apply(support_remote_grade)
 
+    #Downcasting the rating and count columns to the narrowest integer dtype that holds all their values,
+    #pd.to_numeric checks the range so out-of-range values are kept instead of wrapped
 
-    def social_isolation(rating):
-        if rating <= 2:
-            return 'Low'
-        if rating == 3:
-            return 'Medium'
-        else:
-            return 'High'
+    for column in ['social_isolation_rating', 'work_life_balance_rating', 'company_support_for_remote_work',
+                   'number_of_virtual_meetings', 'hours_worked_per_week']:
+        df2[column] = pd.to_numeric(df2[column], downcast='integer')
+    
+    #Creating columns to reflect categories of rating columns
+    #Ratings of 1-2 are Low, 3 is Medium and 4-5 are High, binned in one vectorized pass as an ordered Categorical
 
-    df2['degree_of_social_isolation'] = df2['social_isolation_rating'].apply(social_isolation)
+    rating_bins = [-np.inf, 2, 3, np.inf]
+    rating_labels = ['Low', 'Medium', 'High']
 
+    df2['degree_of_remote_support'] = pd.cut(df2['company_support_for_remote_work'], bins=rating_bins, labels=rating_labels)
 
-    def degree_work_life_balance(grade):
-        if grade <= 2:
-            return 'Low'
-        if grade == 3:
-            return 'Medium'
-        else:
-            return 'High'
+    df2['degree_of_social_isolation'] = pd.cut(df2['social_isolation_rating'], bins=rating_bins, labels=rating_labels)
 
-    df2['degree_of_work-life_balance'] = df2['work_life_balance_rating'].apply(degree_work_life_balance)
+    df2['degree_of_work-life_balance'] = pd.cut(df2['work_life_balance_rating'], bins=rating_bins, labels=rating_labels)
 
     #Dropping unneeded columns
-    df2 = df2.drop(columns = ['employee_id', 'industry', 'mental_health_condition', 'access_to_mental_health_resources','physical_activity', 'sleep_quality', 'region'])
+    df2 = df2.drop(columns = ['employee_id', 'industry', 'mental_health_condition', 'access_to_mental_health_resources','physical_activity', 'sleep_quality', 'region'], errors='ignore')
 
     #Renaming work_location column
 
     df2.rename(columns={'work_location': 'work_type'}, inplace = True)
 
-    #Filtering for tech roles
+    #Filtering for tech roles, then storing job_role of the kept rows as a Categorical for the later crosstab and groupbys
 
-    df2_cleaned = df2[df2["job_role"].isin(['Data Scientist', 'Software Engineer', 'Project Manager'])]
+    df2_cleaned = df2[df2['job_role'].isin(['Data Scientist', 'Software Engineer', 'Project Manager'])]
+    df2_cleaned = df2_cleaned.assign(job_role=df2_cleaned['job_role'].astype('category'))
 
     return df2_cleaned
 
 
 
-def satisfaction_mentalhealth():
-   """
+def satisfaction_mentalhealth(df2_cleaned):
+    """
    This function returns one table and two barplots:
    1. In the table we can see that people who are satisfied with remote work do receive slightly higher company support for remote work, and feel a little more socially isolated than people who feel unsatisfied with remote work (0.03 diff).
    2. The first barplot tells us that satisfied remote workers do feel a little more socially isolated, although that can be interpreted as a tradeoff they are willing to assume.
    3. The second barplot shows us people who are satisfied with remote work do receive more support from their company to work remotely, on average.
    
-   """
-    remotework_satisfaction = df2_cleaned.groupby('satisfaction_with_remote_work')[['company_support_for_remote_work', 'social_isolation_rating']].mean()
-    print('satisfaction level with remote work: ', remotework_satisfaction)
+    """
+    satisfaction_means = df2_cleaned[['satisfaction_with_remote_work', 'company_support_for_remote_work', 'social_isolation_rating']].groupby('satisfaction_with_remote_work', observed=True).mean()
+    print('satisfaction level with remote work: ', satisfaction_means)
 
     print('From the table avobe we can see that people who are satisfied with remote work do receive slightly higher company support for remote work, and feel a little more socially isolated than people who feel unsatisfied with remote work (0.03 diff).')
 
        
-    # Grouping by satisfaction_with_remote_work and calculating the mean for social_isolation_rating
-    remotework_satisfaction = df2_cleaned.groupby('satisfaction_with_remote_work')['social_isolation_rating'].mean()
+    # Mean social_isolation_rating by satisfaction_with_remote_work, taken from the grouped means above
+    remotework_satisfaction = satisfaction_means['social_isolation_rating']
 
     # Plotting a horizontal bar chart with elegant colors
-    remotework_satisfaction.plot(kind='barh', figsize=(8, 6), color=['#4C73A8', '#A9CBA7', '#F4A6C4'])  # Soft blue, green, and pink
+    fig, ax = plt.subplots(figsize=(8, 6))
+    remotework_satisfaction.plot(kind='barh', ax=ax, color=['#4C73A8', '#A9CBA7', '#F4A6C4'])  # Soft blue, green, and pink
 
     # Adjusting the x-axis to zoom in more and make the differences visible
-    plt.xlim(remotework_satisfaction.min() - 0.5, remotework_satisfaction.max() + 0.5)  # Tightened range
+    ax.set_xlim(remotework_satisfaction.min() - 0.5, remotework_satisfaction.max() + 0.5)  # Tightened range
 
     # Adding labels and title
-    plt.xlabel('Average Social Isolation Rating', fontsize=12)
-    plt.ylabel('Satisfaction with Remote Work', fontsize=12)
-    plt.title('Social Isolation Rating by Satisfaction Level with Remote Work', fontsize=14)
+    ax.set_xlabel('Average Social Isolation Rating', fontsize=12)
+    ax.set_ylabel('Satisfaction with Remote Work', fontsize=12)
+    ax.set_title('Social Isolation Rating by Satisfaction Level with Remote Work', fontsize=14)
 
-    # Display the plot
-    plt.tight_layout()
-    plt.savefig("../figures/satisfaction_mentalhealth_barplots_1.jpeg", format="jpeg", dpi=300)
-    plt.show()
+    # Save and close the plot
+    fig.tight_layout()
+    fig.savefig("../figures/satisfaction_mentalhealth_barplots_1.jpeg", format="jpeg", dpi=100)
+    plt.close(fig)
 
     print('This graph above tells us that satisfied remote workers do feel a little more socially isolated, although that can be interpreted as a tradeoff they are willing to assume.\n')
 
-    # Grouping by satisfaction_with_remote_work and calculating the mean for company_support_for_remote_work
-    remotework_satisfaction = df2_cleaned.groupby('satisfaction_with_remote_work')[['company_support_for_remote_work']].mean()
+    # Mean company_support_for_remote_work by satisfaction_with_remote_work, taken from the grouped means above
+    remotework_satisfaction = satisfaction_means[['company_support_for_remote_work']]
 
     # Plotting a horizontal bar chart with elegant colors
-    remotework_satisfaction.plot(kind='barh', figsize=(8, 6), color=['#6B9AC4', '#77B7B1', '#D6A68C'])  # Elegant soft blue, teal, and taupe
+    fig, ax = plt.subplots(figsize=(8, 6))
+    remotework_satisfaction.plot(kind='barh', ax=ax, color=['#6B9AC4', '#77B7B1', '#D6A68C'])  # Elegant soft blue, teal, and taupe
 
     # Adjusting the x-axis to zoom in more and make the differences visible
-    plt.xlim(remotework_satisfaction.min().min() - 0.5, remotework_satisfaction.max().max() + 0.5)  # Tightened range
+    ax.set_xlim(remotework_satisfaction.min().min() - 0.5, remotework_satisfaction.max().max() + 0.5)  # Tightened range
 
     # Adding labels and title
-    plt.xlabel('Average Company Support for Remote Work', fontsize=12)
-    plt.ylabel('Satisfaction with Remote Work', fontsize=12)
-    plt.title('Company Support for Remote Work by Satisfaction Level', fontsize=14)
+    ax.set_xlabel('Average Company Support for Remote Work', fontsize=12)
+    ax.set_ylabel('Satisfaction with Remote Work', fontsize=12)
+    ax.set_title('Company Support for Remote Work by Satisfaction Level', fontsize=14)
 
-    # Display the plot
-    plt.tight_layout()
-    plt.savefig("../figures/satisfaction_mentalhealth_barplots_2.jpeg", format="jpeg", dpi=300)
-    plt.show()
+    # Save and close the plot
+    fig.tight_layout()
+    fig.savefig("../figures/satisfaction_mentalhealth_barplots_2.jpeg", format="jpeg", dpi=100)
+    plt.close(fig)
 
     print('The graph above shows us people who are satisfied with remote work do receive more support from their company to work remotely, on average.')
 
@@ -513,18 +522,19 @@ def work_type_productivity(df2_cleaned):
     This function returns a table and a corresponding piechart: 
     The table shows us the hours worked per week are essentially the same for all categories. If we assume hours worked per week is the amount of hours needed to complete the work, which is a reasonable assumption in the tech sector, the table demonstrates employees have the same efficiency and productivity no matter the type of work (remote, hybrid, or inperson).
     """
-    worktype_productivity = df2_cleaned.groupby('work_type')[['number_of_virtual_meetings', 'hours_worked_per_week']].mean()
-    print('work type and productivity: ', worklocation_productivity)
+    worktype_groups = df2_cleaned[['work_type', 'number_of_virtual_meetings', 'hours_worked_per_week']].groupby('work_type', observed=True)
+    worktype_productivity = worktype_groups.mean()
+    print('work type and productivity: ', worktype_productivity)
 
     # Calculate the total or average hours worked per work type
-    hours_distribution = df2_cleaned.groupby('work_type')['hours_worked_per_week'].sum()
+    hours_distribution = worktype_groups['hours_worked_per_week'].sum()
 
     # Create a pie chart
-    plt.figure(figsize=(8, 8))
-    plt.pie(hours_distribution, labels=hours_distribution.index, autopct='%1.1f%%', startangle=90, colors=sb.color_palette('Purples'))
-    plt.title('Proportion of Total Hours Worked by Work Type')
-    plt.savefig("../figures/work_type_productivity_piechart.jpeg", format="jpeg", dpi=300)
-    plt.show()
+    fig, ax = plt.subplots(figsize=(8, 8))
+    ax.pie(hours_distribution, labels=hours_distribution.index, autopct='%1.1f%%', startangle=90, colors=sns.color_palette('Purples'))
+    ax.set_title('Proportion of Total Hours Worked by Work Type')
+    fig.savefig("../figures/work_type_productivity_piechart.jpeg", format="jpeg", dpi=100)
+    plt.close(fig)
 
     print('the table above shows us the hours worked per week are essentially the same for all categories. If we assume hours worked per week is the amount of hours needed to complete the work, which is a reasonable assumption in the tech sector, the table demonstrates employees have the same efficiency and productivity no matter the type of work (remote, hybrid, or inperson).')
 
@@ -534,11 +544,10 @@ def stress_worktype_rel(df2_cleaned):
     Displaying correlation between stress levels (low, medium, high) and work type (remote, hybrid, onsite)
     """
     
-    df_stress = df2_cleaned.groupby("stress_level")["work_type"].apply(lambda x: (x.value_counts(normalize=True) * 100))
-    df_stress = df_stress.unstack()
-    df_stress.columns = ['Remote', 'Hybrid', 'Onsite']
+    df_stress = pd.crosstab(df2_cleaned["stress_level"], df2_cleaned["work_type"], normalize='index').mul(100)
     row_order = ['Low', 'Medium', 'High']
-    df_stress = df_stress.loc[row_order]
+    df_stress = df_stress.reindex(index=row_order, columns=['Remote', 'Hybrid', 'Onsite'])
+    df_stress.columns.name = None
     df_stress['Total'] = df_stress.sum(axis=1)
     df_stress = df_stress.round({'Remote':2, 'Hybrid':2, 'Onsite':2})
    
@@ -548,10 +557,10 @@ def stress_jobrole_rel(df2_cleaned):
     """
     Displaying correlation between stress levels (low, medium, high) and job role (Data Scientist, Project Manager, Software Engineer)
     """
-    df_stress = df2_cleaned.groupby("stress_level")["job_role"].apply(lambda x: (x.value_counts(normalize=True) * 100))
-    df_stress = df_stress.unstack()
+    df_stress = pd.crosstab(df2_cleaned["stress_level"], df2_cleaned["job_role"], normalize='index').mul(100)
     row_order = ['Low', 'Medium', 'High']
-    df_stress = df_stress.loc[row_order]
+    df_stress = df_stress.reindex(row_order)
+    df_stress.columns.name = None
     df_stress['Total'] = df_stress.sum(axis=1)
     df_stress = df_stress.round({'Data Scientist':2, 'Project Manager':2, 'Software Engineer':2})
    
@@ -566,19 +575,35 @@ def descriptive_statistics_hours_worked(df2_cleaned):
     4. company_support_for_remote_work
     """
     
-    df_stats_hours_worked = df2_cleaned.groupby("work_type")[["hours_worked_per_week"]].agg(["mean", "median", "min", "max"]).reset_index()
-    df_stats_hours_worked[("hours_worked_per_week", "mean")] = df_stats_hours_worked[("hours_worked_per_week", "mean")].round(2)
-    print(df_stats_hours_worked)
-
-    df_stats_virtual_meetings = df2_cleaned.groupby("work_type")[["number_of_virtual_meetings"]].agg(["mean", "median", "min", "max"]).reset_index()
-    df_stats_virtual_meetings[("number_of_virtual_meetings", "mean")] = df_stats_virtual_meetings[("number_of_virtual_meetings", "mean")].round(2)
-    print(df_stats_virtual_meetings)
-
-    df_stats_work_life = df2_cleaned.groupby("work_type")[["work_life_balance_rating"]].agg(["mean", "median", "min", "max"]).reset_index()
-    df_stats_work_life[("work_life_balance_rating", "mean")] = df_stats_work_life[("work_life_balance_rating", "mean")].round(2)
-    print(df_stats_work_life)
-
-    df_stats_company_support = df2_cleaned.groupby("work_type")[["company_support_for_remote_work"]].agg(["mean", "median", "min", "max"]).reset_index()
-    df_stats_company_support[("company_support_for_remote_work", "mean")] = df_stats_company_support[("company_support_for_remote_work", "mean")].round(2)
-    print(df_stats_company_support)
-            
+    stats_columns = ["hours_worked_per_week", "number_of_virtual_meetings", "work_life_balance_rating", "company_support_for_remote_work"]
+
+    # Group once and aggregate all four columns in a single pass
+    df_stats = df2_cleaned[["work_type", *stats_columns]].groupby("work_type", observed=True).agg(["mean", "median", "min", "max"])
+    df_stats = df_stats.round({(column, "mean"): 2 for column in stats_columns})
+
+    for column in stats_columns:
+        print(df_stats[[column]].reset_index())
+
+    return df_stats
+
+def is_cache_fresh(cache_file, source_files):
+    """
+    Checks whether a cached cleaned data file can be reused instead of cleaning the raw data again.
+
+    Parameters:
+    cache_file (str): The path of the cached file, e.g. a cleaned parquet file.
+    source_files (list): The paths the cache was built from, e.g. the raw csv file and functions.py.
+
+    Returns:
+    bool: True if the cache file exists and is not older than any of the source files.
+
+    Examples:
+    >>> is_cache_fresh('../data/clean/df_cleaned.parquet', ['../data/raw/Extended_Employee_Performance_and_Productivity_Data.csv'])
+    """
+
+    if not os.path.exists(cache_file):
+        return False
+
+    cache_time = os.path.getmtime(cache_file)
+
+    return all(os.path.getmtime(source_file) <= cache_time for source_file in source_files)
@@ -5,6 +5,9 @@ import numpy as np
 import yaml
 
 from functions import cleaning_productivity_data, describe_work_type_stats, plot_work_type_distribution, plot_stacked_work_and_overtime_hours, calculate_avg_median_scores_by_work_type, plot_average_scores_by_work_type, plot_scores_by_work_type, heat_map
+from functions import df_mentalhealth_cleaning, satisfaction_mentalhealth, work_type_productivity, stress_worktype_rel, stress_jobrole_rel, descriptive_statistics_hours_worked
+from functions import is_cache_fresh
+import functions
 
 #opens yaml file
 try:
@@ -13,15 +16,23 @@ try:
 except:
     print("Sorry, configuration file not found!")
 
-#loads csv from yaml file directory
-df = pd.read_csv(config['input_data']['productivity_file'])
+#display all columns
+pd.set_option('display.max_columns', None)
 
-df_cleaned = cleaning_productivity_data(df)
+#reuses the cleaned parquet file from a previous run, unless the raw csv or the cleaning functions changed since
+if is_cache_fresh(config['cache_data']['productivity_file'], [config['input_data']['productivity_file'], "../config.yaml", functions.__file__]):
+    df_cleaned = pd.read_parquet(config['cache_data']['productivity_file'])
+else:
+    #loads csv from yaml file directory
+    df = pd.read_csv(config['input_data']['productivity_file'], usecols=config['input_columns']['productivity_file'], dtype_backend='pyarrow', engine='pyarrow')
 
-#saves csv to yaml file directory
-df_cleaned.to_csv(config['output_data']['productivity_file'], index=False)
+    df_cleaned = cleaning_productivity_data(df)
 
-describe_stats = describe_work_type_stats(df_cleaned)
+    #saves csv and parquet cache to yaml file directory
+    df_cleaned.to_csv(config['output_data']['productivity_file'], index=False)
+    df_cleaned.to_parquet(config['cache_data']['productivity_file'], compression='zstd', index=False)
+
+describe_stats = describe_work_type_stats(df_cleaned, verbose=True)
 
 '''
 Interpretation of descriptive stats:
@@ -43,11 +54,18 @@ Work type doesn’t show significant differences in productivity, satisfaction o
 
 plot_work_type_distribution(df_cleaned, 'work_type')
 
-plot_stacked_work_and_overtime_hours(df_cleaned)
+#groups by work type once, the grouping is shared by the functions below
+work_type_groups = df_cleaned[['work_type', 'work_hours_per_week', 'overtime_hours', 'performance_score', 'employee_satisfaction_score', 'motivation_score']].groupby('work_type', observed=True)
+
+mean_hours = work_type_groups[['work_hours_per_week', 'overtime_hours']].mean()
+
+mean_scores = work_type_groups[['performance_score', 'employee_satisfaction_score', 'motivation_score']].mean()
 
-pivot_avg_scores = calculate_avg_median_scores_by_work_type(df_cleaned)
+plot_stacked_work_and_overtime_hours(mean_hours)
 
-plot_average_scores_by_work_type(df_cleaned, 'work_type')
+pivot_avg_scores = calculate_avg_median_scores_by_work_type(work_type_groups)
+
+plot_average_scores_by_work_type(mean_scores)
 
 plot_scores_by_work_type(df_cleaned)
 
@@ -56,8 +74,19 @@ heat_map(df_cleaned)
 
 # Mental Health Dataset
 
+#reuses the cleaned parquet file from a previous run, unless the raw csv or the cleaning functions changed since
+if is_cache_fresh(config['cache_data']['mental_health_file'], [config['input_data']['mental_health_file'], "../config.yaml", functions.__file__]):
+    df2_cleaned = pd.read_parquet(config['cache_data']['mental_health_file'])
+else:
+    #loads csv from yaml file directory
+    df2 = pd.read_csv(config['input_data']['mental_health_file'], usecols=config['input_columns']['mental_health_file'], dtype_backend='pyarrow', engine='pyarrow')
+
+    #cleans the mental health data once, the result is reused by all functions below
+    df2_cleaned = df_mentalhealth_cleaning(df2)
 
-df2_cleaned = df_mentalhealth_cleaning(df2)
+    #saves csv and parquet cache to yaml file directory
+    df2_cleaned.to_csv(config['output_data']['mental_health_file'], index=False)
+    df2_cleaned.to_parquet(config['cache_data']['mental_health_file'], compression='zstd', index=False)
 
 satisfaction_mentalhealth(df2_cleaned)
 